@@ -113,7 +113,7 @@ def run_analysis_runner_from_args(args: argparse.ArgumentParser):
     return run_analysis_runner(**vars(args))
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class RepositorySpecificInformation:
     repository: str
     commit: str
@@ -3,7 +3,6 @@ CLI options for standard analysis-runner
 """
 
 import argparse
-import os
 import sys
 
 import requests
@@ -98,10 +97,11 @@ def run_config(
     if config:
         _config = dict(read_configs(config))
 
-    server_endpoint = os.path.join(
-        get_server_endpoint(is_test=use_test_server, server_url=server_url),
-        'config',
+    server_endpoint = get_server_endpoint(
+        is_test=use_test_server,
+        server_url=server_url,
     )
+    server_endpoint = f'{server_endpoint.rstrip("/")}/config'
     _token = get_google_identity_token(server_endpoint)
 
     response = requests.post(
@@ -118,6 +118,7 @@ def run_config(
     )
     try:
         response.raise_for_status()
+        response_config = response.json()
         if config_output:
             if not config_output.endswith('.toml'):
                 logger.warning(
@@ -125,10 +126,10 @@ def run_config(
                     'file you have provided is not .toml',
                 )
             with open(config_output, 'w+', encoding='utf-8') as f:
-                toml.dump(response.json(), f)
+                toml.dump(response_config, f)
                 logger.info(f'Wrote config to {config_output}')
         else:
-            toml.dump(response.json(), sys.stdout)
+            toml.dump(response_config, sys.stdout)
 
     except requests.HTTPError as e:
         logger.critical(
@@ -4,9 +4,12 @@ Cromwell CLI
 
 import argparse
 import json
-import os.path
+import re
+from collections.abc import Callable
+from shlex import quote
 from typing import Any
 
+import orjson
 import requests
 
 from analysis_runner.util import (
@@ -28,18 +31,6 @@ from cpg_utils.git import (
 )
 
 
-def cromwell_modes() -> dict:
-    """This is a function instead of a constant so we don't see ordering definition errors."""
-    return {
-        'submit': (_add_cromwell_submit_args_to, _run_cromwell),
-        'status': (_add_cromwell_status_args, _check_cromwell_status),
-        'visualise': (
-            _add_cromwell_metadata_visualier_args,
-            _visualise_cromwell_metadata_from_file,
-        ),
-    }
-
-
 def add_cromwell_args(
     parser: argparse.ArgumentParser | None = None,
 ) -> argparse.ArgumentParser:
@@ -49,7 +40,7 @@ def add_cromwell_args(
 
     subparsers = parser.add_subparsers(dest='cromwell_mode')
 
-    for mode, (add_args, _) in cromwell_modes().items():
+    for mode, (add_args, _) in CROMWELL_MODES.items():
         add_args(subparsers.add_parser(mode))
 
     return parser
@@ -57,14 +48,12 @@ def add_cromwell_args(
 
 def run_cromwell_from_args(args: argparse.ArgumentParser):
     """Run cromwell CLI mode from argparse.args"""
-    _cromwell_modes = cromwell_modes()
-
     kwargs = vars(args)
     cromwell_mode = kwargs.pop('cromwell_mode')
-    if cromwell_mode not in _cromwell_modes:
+    if cromwell_mode not in CROMWELL_MODES:
         raise NotImplementedError(cromwell_mode)
 
-    return _cromwell_modes[cromwell_mode][1](**kwargs)
+    return CROMWELL_MODES[cromwell_mode][1](**kwargs)
 
 
 def _add_generic_cromwell_visualiser_args(
@@ -218,7 +207,11 @@ def _run_cromwell(  # noqa: C901
 
     _inputs_dict = None
     if dynamic_inputs:
-        _inputs_dict = parse_additional_args(dynamic_inputs)
+        try:
+            _inputs_dict = parse_additional_args(dynamic_inputs)
+        except ValueError as e:
+            # a usage error, so report it without the traceback
+            raise SystemExit(f'Invalid workflow inputs: {e}') from e
         if workflow_input_prefix:
             _inputs_dict = {
                 workflow_input_prefix + k: v for k, v in _inputs_dict.items()
@@ -248,7 +241,7 @@ def _run_cromwell(  # noqa: C901
         server_url=server_url,
         is_test=use_test_server,
     )
-    endpoint = os.path.join(server_endpoint, '/cromwell')
+    endpoint = f'{server_endpoint.rstrip("/")}/cromwell'
 
     if dry_run:
         logger.warning('Dry-run, printing curl and exiting')
@@ -257,11 +250,13 @@ curl --location --request POST \\
     '{endpoint}' \\
     --header "Authorization: Bearer $(gcloud auth print-identity-token)" \\
     --header "Content-Type: application/json" \\
-    --data-raw '{json.dumps(body, indent=4)}'"""
+    --data-raw {quote(json.dumps(body, indent=2))}"""
 
         print(curl)
         return
 
+    # stdlib json, as orjson can't serialise integers wider than 64 bits, which
+    # try_parse_value happily produces from long numeric inputs
     response = requests.post(
         endpoint,
         json=body,
@@ -280,6 +275,18 @@ curl --location --request POST \\
         )
 
 
+# metadata keys that WorkflowMetadataModel.display doesn't use, but which make up
+# most of the metadata for large workflows (eg: every call's inputs and outputs)
+STATUS_DISPLAY_EXCLUDED_METADATA_KEYS = (
+    'commandLine',
+    'executionEvents',
+    'inputs',
+    'outputs',
+    'runtimeAttributes',
+    'submittedFiles',
+)
+
+
 def _check_cromwell_status(
     workflow_id: str,
     json_output: str | None,
@@ -290,25 +297,36 @@ def _check_cromwell_status(
     """Check cromwell status with workflow_id"""
 
     server_endpoint = get_server_endpoint(server_url, is_test)
-    url = os.path.join(
-        server_endpoint,
-        f'cromwell/{workflow_id}/metadata',
-    )
+    url = f'{server_endpoint.rstrip("/")}/cromwell/{workflow_id}/metadata'
 
+    # when only displaying the status, skip the (large) keys the display never reads
+    params = (
+        None
+        if json_output
+        else [('excludeKey', key) for key in STATUS_DISPLAY_EXCLUDED_METADATA_KEYS]
+    )
     response = requests.get(
         url,
+        params=params,
         headers={
             'Authorization': f'Bearer {get_google_identity_token(server_endpoint)}',
         },
         timeout=60,
+        stream=True,
     )
     response.raise_for_status()
-    d = response.json()
 
     if json_output:
         logger.info(f'Writing metadata to: {json_output}')
-        with open(json_output, 'w+', encoding='utf-8') as f:
-            json.dump(d, f)
+        # stream the raw bytes to disk rather than decoding and re-encoding them
+        with open(json_output, 'wb+') as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+            f.seek(0)
+            d = orjson.loads(f.read())
+    else:
+        # metadata for large scatters can be huge, orjson decodes the bytes directly
+        d = orjson.loads(response.content)
 
     model = WorkflowMetadataModel.parse(d)
     print(model.display(**kwargs))
@@ -319,12 +337,23 @@ def _visualise_cromwell_metadata_from_file(
     **kwargs: Any,
 ) -> None:
     """Visualise cromwell metadata progress from a json file"""
-    with open(metadata_file, encoding='utf-8') as f:
-        model = WorkflowMetadataModel.parse(json.load(f))
+    with open(metadata_file, 'rb') as f:
+        model = WorkflowMetadataModel.parse(orjson.loads(f.read()))
 
     visualise_cromwell_metadata(model, **kwargs)
 
 
+# defined after the functions it references, {mode: (add_args, run_mode)}
+CROMWELL_MODES: dict[str, tuple[Callable, Callable]] = {
+    'submit': (_add_cromwell_submit_args_to, _run_cromwell),
+    'status': (_add_cromwell_status_args, _check_cromwell_status),
+    'visualise': (
+        _add_cromwell_metadata_visualier_args,
+        _visualise_cromwell_metadata_from_file,
+    ),
+}
+
+
 def visualise_cromwell_metadata(
     model: WorkflowMetadataModel,
     expand_completed: bool,
@@ -334,32 +363,39 @@ def visualise_cromwell_metadata(
     print(model.display(expand_completed=expand_completed, monochrome=monochrome))
 
 
+# strings with a fixed meaning, resolved with a single dict probe
+# ('None' / 'null' are deliberately passed through as-is)
+_LITERAL_VALUES: dict[str, Any] = {
+    'None': 'None',
+    'null': 'null',
+    'true': True,
+    'false': False,
+}
+_MISSING = object()
+_INT_RE = re.compile(r'^[-+]?\d+$')
+_FLOAT_RE = re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$')
+
+
 def try_parse_value(value: str | None):
     """Try parse value from command line string"""
-    if value is None or value == 'None' or value == 'null':
+    if value is None:
         return value
 
-    if isinstance(value, list):
-        return list(map(try_parse_value, value))
-
     if not isinstance(value, str):
+        if isinstance(value, list):
+            return list(map(try_parse_value, value))
         # maybe the CLI did some parsing
         return value
 
-    if value == 'true':
-        return True
-    if value == 'false':
-        return False
+    literal = _LITERAL_VALUES.get(value, _MISSING)
+    if literal is not _MISSING:
+        return literal
 
-    # EAFP
-    try:
+    # check the shape first, rather than paying for a raised ValueError per token
+    if _INT_RE.match(value):
         return int(value)
-    except ValueError:
-        pass
-    try:
+    if _FLOAT_RE.match(value):
         return float(value)
-    except ValueError:
-        pass
 
     return value
 
@@ -369,7 +405,7 @@ def parse_keyword(keyword: str):
     return keyword[2:].replace('-', '_')
 
 
-def parse_additional_args(args: list[str]) -> dict[str, Any]:  # noqa: C901
+def parse_additional_args(args: list[str]) -> dict[str, Any]:
     """
     Parse a list of strings to an inputs json
 
@@ -402,7 +438,7 @@ def parse_additional_args(args: list[str]) -> dict[str, Any]:  # noqa: C901
     {'keyword': ['value']}
 
     >>> parse_additional_args(['--keyword', 'value1', 'value2', '--keyword'])
-    {'keyword': [['value1', 'value2']}
+    {'keyword': [['value1', 'value2']]}
 
         * Keyword with multiple values, followed by same keyword with multiple values results in nested lists
 
@@ -412,49 +448,37 @@ def parse_additional_args(args: list[str]) -> dict[str, Any]:  # noqa: C901
 
     keywords: dict[str, Any] = {}
 
-    def add_keyword_value_to_keywords(keyword: str | None, value: Any) -> None:
+    def add_keyword_value_to_keywords(keyword: str | None, values: list[str]) -> None:
         if not keyword:
             return
+
+        value: Any = None
+        if len(values) == 1:
+            value = try_parse_value(values[0])
+        elif values:
+            value = try_parse_value(values)
+
         if keyword in keywords:
-            if value is None:
-                value = [keywords.get(keyword)]
-            else:
-                value = [keywords.get(keyword), try_parse_value(new_value)]
+            previous = keywords[keyword]
+            value = [previous] if value is None else [previous, value]
         elif value is None:
             # flag
             value = True
-        else:
-            value = try_parse_value(value)
 
         keywords[keyword] = value
 
-    current_keyword = None
-    new_value: Any = None
-
-    for arg in args:
-        if not arg.startswith('--'):
-            if new_value is None:
-                # if it's the first value we're seeing, set it
-                new_value = arg
-            elif not isinstance(new_value, list):
-                # if it's the second value we're seeing
-                new_value = [new_value, arg]
-            else:
-                # 3rd or more, just keep adding it to an array
-                new_value.append(arg)
-
-            continue
-
-        # found a new keyword
-        if current_keyword is None:
-            # first case, do nothing
-            current_keyword = parse_keyword(arg)
-            continue
-
-        add_keyword_value_to_keywords(current_keyword, new_value)
-        current_keyword = parse_keyword(arg)
-        new_value = None
-
-    add_keyword_value_to_keywords(current_keyword, new_value)
+    # find every keyword in one pass, the values for a keyword are then just the
+    # slice of args up to the next keyword
+    keyword_indices = [idx for idx, arg in enumerate(args) if arg.startswith('--')]
+    if args and (not keyword_indices or keyword_indices[0] > 0):
+        leading_values = args[: keyword_indices[0] if keyword_indices else len(args)]
+        raise ValueError(
+            f'Could not parse inputs, values {leading_values} were not preceded by '
+            'a --keyword',
+        )
+
+    value_ends = [*keyword_indices[1:], len(args)] if keyword_indices else []
+    for idx, end in zip(keyword_indices, value_ends, strict=True):
+        add_keyword_value_to_keywords(parse_keyword(args[idx]), args[idx + 1 : end])
 
     return keywords
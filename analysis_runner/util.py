@@ -14,6 +14,8 @@ BRANCH = 'main'
 SERVER_ENDPOINT = 'https://server-a2pko7ameq-ts.a.run.app'
 SERVER_TEST_ENDPOINT = 'https://server-test-a2pko7ameq-ts.a.run.app'
 ANALYSIS_RUNNER_PROJECT_ID = 'analysis-runner'
+# matches the version line of _version.py, eg: __version__ = '<version>'
+VERSION_LINE_PATTERN = re.compile(r"^__version__ = '(.+)'$", re.MULTILINE)
 
 logger = logging.getLogger('analysis_runner')
 logger.addHandler(logging.StreamHandler())
@@ -123,7 +125,7 @@ def _perform_version_check() -> None:
 
     # with this URL, we're looking for a line with format:
     #   __version__ = '<version>'
-    # match it with regex: r"__version__ = '(.+)'$"
+    # match it with the precompiled VERSION_LINE_PATTERN
     version_url = (
         'https://raw.githubusercontent.com/populationgenomics/'
         'analysis-runner/main/analysis_runner/_version.py'
@@ -138,24 +140,23 @@ def _perform_version_check() -> None:
             f'information about the analysis-runner: {e}',
         )
         return
-    for line in data.splitlines(keepends=False):
-        if not line.startswith('__version__ = '):
-            continue
-
-        match = re.match("__version__ = '(.+)'$", line)
-        if match:
-            latest_version = match.groups()[0]
-            if current_version != latest_version:
-                message = (
-                    f'Your version of analysis-runner is out of date: '
-                    f'{current_version} != {latest_version} (current vs latest).\n'
-                    f'Your analysis will still be submitted, but may not work as expected.'
-                    f' You can update the analysis-runner by running '
-                    f'"pip install analysis-runner=={latest_version}".'
-                )
-                logger.warning(message)
+
+    # search the whole file in one pass, rather than matching line by line
+    match = VERSION_LINE_PATTERN.search(data)
+    if not match:
         return
 
+    latest_version = match.groups()[0]
+    if current_version != latest_version:
+        message = (
+            f'Your version of analysis-runner is out of date: '
+            f'{current_version} != {latest_version} (current vs latest).\n'
+            f'Your analysis will still be submitted, but may not work as expected.'
+            f' You can update the analysis-runner by running '
+            f'"pip install analysis-runner=={latest_version}".'
+        )
+        logger.warning(message)
+
 
 class AnsiiColors:
     """
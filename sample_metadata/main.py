@@ -7,12 +7,20 @@ in the Sample-Metadata database.
 
 import base64
 import json
+import time
 from typing import Any, Dict, Literal
 from urllib.parse import urlencode
 
 import requests
 
 AUDIENCE = 'https://sample-metadata-api-mnrpw3mdza-ts.a.run.app'
+# refresh the cached identity token this many seconds before it expires
+TOKEN_EXPIRY_MARGIN = 5 * 60
+
+# reused across warm invocations of the function, so we don't mint a new
+# identity token (or open a new connection) for every submission
+session = requests.Session()
+_identity_token_cache: dict[str, tuple[str, int]] = {}
 
 
 def sample_metadata(data: Dict[Literal['data'], str], unused_context: Any):
@@ -62,7 +70,7 @@ def sample_metadata(data: Dict[Literal['data'], str], unused_context: Any):
 
     try:
         token = get_identity_token()
-        r = requests.put(
+        r = session.put(
             f'{AUDIENCE}/api/v1/analysis-runner/{project}/?' + q,
             json=meta,
             headers={'Authorization': f'Bearer {token}'},
@@ -79,11 +87,25 @@ def sample_metadata(data: Dict[Literal['data'], str], unused_context: Any):
 
 def get_identity_token() -> str:
     """
-    Get identity token
+    Get identity token, reusing the cached one until it's close to expiring
     Source: https://cloud.google.com/functions/docs/securing/function-identity#identity_tokens
     """
+    cached = _identity_token_cache.get(AUDIENCE)
+    if cached and time.time() < cached[1] - TOKEN_EXPIRY_MARGIN:
+        return cached[0]
+
     meta_url = 'http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/identity'
     url = f'{meta_url}?audience={AUDIENCE}&format=full'
-    r = requests.get(url=url, headers={'Metadata-Flavor': 'Google'}, timeout=30)
+    r = session.get(url=url, headers={'Metadata-Flavor': 'Google'}, timeout=30)
     r.raise_for_status()
-    return r.text
+    token = r.text
+    _identity_token_cache[AUDIENCE] = (token, get_token_expiry(token))
+    return token
+
+
+def get_token_expiry(token: str) -> int:
+    """Get the expiry (as a unix timestamp) from the payload of a JWT"""
+    payload = token.split('.')[1]
+    # JWTs strip the base64 padding, so add it back before decoding
+    payload += '=' * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload))['exp']
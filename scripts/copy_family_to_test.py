@@ -35,17 +35,35 @@ def get_family_id_to_participant_map(project: str) -> dict[str, list[dict]]:
     return dict(result)
 
 
-def copy_to_test(project: str, path: str):
+def copy_to_test(project: str, paths: list[str]):
     """
-    Copy a single file from a main bucket path to the equivalent test bucket
+    Copy files from main bucket paths to the equivalent test bucket paths.
+    Sources are grouped by destination directory, and each group is copied with
+    a single `gcloud storage cp -I` (paths read from stdin), rather than one
+    process per file
     """
-    test_path = path.replace(
-        f'cpg-{project}-main',
-        f'cpg-{project}-test',
-    )
-
-    subprocess.run(['gsutil', 'cp', path, test_path], check=True)  # noqa: S603,S607
-    logging.info(f'Copied {test_path}')
+    sources_by_test_dir = defaultdict(list)
+    for path in paths:
+        test_path = path.replace(
+            f'cpg-{project}-main',
+            f'cpg-{project}-test',
+        )
+        sources_by_test_dir[test_path.rsplit('/', 1)[0]].append(path)
+
+    for test_dir, sources in sources_by_test_dir.items():
+        subprocess.run(  # noqa: S603
+            [  # noqa: S607
+                'gcloud',
+                'storage',
+                'cp',
+                '-I',
+                f'{test_dir}/',
+            ],
+            input='\n'.join(sources),
+            text=True,
+            check=True,
+        )
+        logging.info(f'Copied {len(sources)} files to {test_dir}')
 
 
 def main(
@@ -102,12 +120,12 @@ def main(
     )
 
     # Copy files to test
+    paths = []
     for cram in latest_crams:
-        copy_to_test(project, cram['output'])
-        copy_to_test(project, cram['output'] + '.crai')
+        paths.extend([cram['output'], cram['output'] + '.crai'])
     for gvcf in latest_gvcfs:
-        copy_to_test(project, gvcf['output'])
-        copy_to_test(project, gvcf['output'] + '.tbi')
+        paths.extend([gvcf['output'], gvcf['output'] + '.tbi'])
+    copy_to_test(project, paths)
 
 
 if __name__ == '__main__':
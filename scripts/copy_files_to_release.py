@@ -27,14 +27,8 @@ def check_paths_exist(paths: list[str]):
     """
     invalid_paths = False
     for path in paths:
-        # gsutil ls <path> returns '<path>\n' if path exists
-        result = subprocess.run(
-            ['gsutil', 'ls', path],
-            check=True,
-            capture_output=True,
-            text=True,
-        ).stdout.strip('\n')
-        if result == path:
+        # check in-process with the storage client, rather than forking gsutil per path
+        if storage.Blob.from_string(path, client=client).exists():
             continue
         # If path does not exist, log the path and set invalid_paths to True
         logging.info(f'Invalid path: {path}')
@@ -59,9 +53,12 @@ def copy_to_release(project: str, billing_project: str, paths: list[str]):
             '--billing-project',
             billing_project,
             'cp',
-            *paths,
+            '-I',
             release_path,
         ],
+        # stream the sources on stdin, rather than as (possibly too many) arguments
+        input='\n'.join(paths),
+        text=True,
         check=True,
     )
     logging.info(f'Copied {paths} into {release_path}')
@@ -1,17 +1,24 @@
 import asyncio
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 import requests
 from google.cloud import storage
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from cpg_utils import to_path
-from cpg_utils.constants import CROMWELL_URL
-from cpg_utils.cromwell import get_cromwell_oauth_token
+from cpg_utils.cloud import get_google_identity_token
+from cpg_utils.constants import CROMWELL_AUDIENCE, CROMWELL_URL
 from metamist.apis import AnalysisApi, ParticipantApi
 from metamist.models import Analysis, AnalysisStatus
 
+MAX_COPY_WORKERS = 8
+# the metadata keys used by parse_workflow_status_and_outputs
+METADATA_KEYS = ('backendLabels', 'executionStatus', 'failures', 'outputs')
+
 
 def get_workflow_metadata_from_file(workflow_metadata_file_path: str):
     try:
@@ -25,14 +32,38 @@ def get_workflow_metadata_from_file(workflow_metadata_file_path: str):
         sys.exit(1)
 
 
-def get_workflow_metadata_from_api(workflow_id: str):
+def get_cromwell_session() -> requests.Session:
+    """
+    Build a session for talking to Cromwell, so the connection and auth token
+    are reused across all the workflows we fetch, and transient errors are retried
+    """
+    # back off exponentially, and honour Cromwell's Retry-After when it's throttling us
+    retries = Retry(
+        total=8,
+        backoff_factor=2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    )
+    session = requests.Session()
+    session.mount(
+        CROMWELL_URL,
+        HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries),
+    )
+    session.headers.update(
+        {
+            'accept': 'application/json',
+            'Authorization': f'Bearer {get_google_identity_token(CROMWELL_AUDIENCE)}',
+        },
+    )
+    return session
+
+
+def get_workflow_metadata_from_api(workflow_id: str, session: requests.Session):
     url = f"{CROMWELL_URL}/api/workflows/v1/{workflow_id}/metadata"
-    headers = {
-        'accept': 'application/json',
-        'Authorization': f'Bearer {get_cromwell_oauth_token()}',
-    }
+    # only request the call keys we parse, rather than the (very large) full metadata
+    params = [('includeKey', key) for key in METADATA_KEYS]
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = session.get(url, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -49,7 +80,7 @@ def parse_workflow_status_and_outputs(json_data: dict):
 
     for key, value in calls.items():
         if key.startswith('GatherSampleEvidence.'):
-            workflow_name = key.split('.')[-1]
+            workflow_name = key.rpartition('.')[2]
             if value:
                 # Get the dataset and sequencing group ID
                 if not dataset or not sg_id:
@@ -87,6 +118,26 @@ def parse_workflow_status_and_outputs(json_data: dict):
     return {sg_id.upper(): {'dataset': dataset, 'status': status, 'outputs': outputs}}
 
 
+def copy_blob(
+    source_blob: storage.Blob,
+    destination_bucket: storage.Bucket,
+    destination_blob_name: str,
+) -> None:
+    """Copy a blob, unless an identical copy is already at the destination."""
+    # skip outputs a previous (interrupted) run already copied, so re-running
+    # the script resumes the collection rather than repeating every copy
+    existing_blob = destination_bucket.get_blob(destination_blob_name)
+    if existing_blob is not None and existing_blob.crc32c == source_blob.crc32c:
+        print(f"Blob {destination_blob_name} already copied, skipping")
+        return
+    blob_copy = source_blob.bucket.copy_blob(
+        source_blob,
+        destination_bucket,
+        destination_blob_name,
+    )
+    print(f"Blob {blob_copy.name} copied")
+
+
 def copy_outputs_to_bucket(
     outputs: dict,
     source_bucket_name: str,
@@ -100,35 +151,46 @@ def copy_outputs_to_bucket(
     source_bucket = storage_client.bucket(source_bucket_name)
     destination_bucket = storage_client.bucket(destination_bucket_name)
 
+    copies = []
     for _, output in outputs.items():
         for _, value in output.items():
+            blob_name = value.replace(f'gs://{source_bucket_name}/', '')
+            # fetch the metadata once, it's both the copy source and has the size
+            source_blob = source_bucket.get_blob(blob_name)
+            if source_blob is None:
+                if not dry_run:
+                    raise FileNotFoundError(f'Output {value} does not exist')
+                # report every missing output in a dry run, rather than the first
+                print(f'DRY RUN: Output {value} does not exist, would have failed')
+                continue
             if value.endswith('scramble.vcf.gz'):
-                analysis_file_sizes['scramble'] = to_path(value).stat().st_size
+                analysis_file_sizes['scramble'] = source_blob.size
             elif value.endswith('wham.vcf.gz'):
-                analysis_file_sizes['wham'] = to_path(value).stat().st_size
+                analysis_file_sizes['wham'] = source_blob.size
             elif value.endswith('manta.vcf.gz'):
-                analysis_file_sizes['manta'] = to_path(value).stat().st_size
-            blob_name = value.replace(f'gs://{source_bucket_name}/', '')
-            source_blob = source_bucket.blob(blob_name)
-            destination_blob_name = (
-                f'sv_evidence/{blob_name.split("/")[-1]}'  # Copy to sv_evidence folder
-            )
+                analysis_file_sizes['manta'] = source_blob.size
+            # Copy to sv_evidence folder
+            destination_blob_name = f'sv_evidence/{blob_name.rpartition("/")[2]}'
             destination_gs_url = (
                 f'gs://{destination_bucket_name}/{destination_blob_name}'
             )
             if not dry_run:
                 print(f'Copying {source_blob.name} to {destination_gs_url}')
-                blob_copy = source_bucket.copy_blob(
-                    source_blob,
-                    destination_bucket,
-                    destination_blob_name,
-                )
-                print(f"Blob {blob_copy.name} copied")
+                copies.append((source_blob, destination_blob_name))
             else:
                 print(
                     f"DRY RUN: Would have copied {source_blob.name} to {destination_gs_url}",
                 )
 
+    # the copies are independent and network-bound, so run them concurrently
+    with ThreadPoolExecutor(max_workers=MAX_COPY_WORKERS) as executor:
+        futures = [
+            executor.submit(copy_blob, source_blob, destination_bucket, blob_name)
+            for source_blob, blob_name in copies
+        ]
+        for future in futures:
+            future.result()
+
     return analysis_file_sizes
 
 
@@ -238,8 +300,9 @@ def main(dataset: list[str], workflow_id: list[str], dry_run: bool = False):
     sg_analyses_sizes = {}
     sg_datasets = {}
     sg_analyses = {}
+    session = get_cromwell_session()
     for wf_id in workflow_id:
-        json_data = get_workflow_metadata_from_api(wf_id)
+        json_data = get_workflow_metadata_from_api(wf_id, session=session)
         workflow_status = parse_workflow_status_and_outputs(json_data)
 
         sg_id = next(iter(workflow_status.keys()))
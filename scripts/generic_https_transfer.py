@@ -11,11 +11,11 @@ import click
 from cloudpathlib import AnyPath
 
 from cpg_utils.config import get_config
-from cpg_utils.hail_batch import (
-    authenticate_cloud_credentials_in_job,
-    dataset_path,
-    get_batch,
-)
+from cpg_utils.hail_batch import dataset_path, get_batch
+
+# point gcloud at the job's service account key, rather than running
+# 'gcloud auth activate-service-account' at the start of every job
+GSA_KEY_PATH = '/gsa-key/key.json'
 
 
 @click.command('Transfer_datasets from signed URLs')
@@ -26,7 +26,12 @@ from cpg_utils.hail_batch import (
     help='Use filenames defined before each url',
 )
 @click.option('--presigned-url-file-path')
-def main(presigned_url_file_path: str, filenames: bool):
+@click.option(
+    '--urls-per-job',
+    default=10,
+    help='Number of URLs to transfer (concurrently) within each job',
+)
+def main(presigned_url_file_path: str, filenames: bool, urls_per_job: int):
     """
     Given a list of presigned URLs, download the files and upload them to GCS.
     If each signed url is prefixed by a filename and a space, use the --filenames flag
@@ -41,17 +46,16 @@ def main(presigned_url_file_path: str, filenames: bool):
     assert all({billing_project, cpg_driver_image, dataset, output_prefix})
     names = None
     with AnyPath(presigned_url_file_path).open() as file:
-        if filenames:
-            names = [
-                line.strip().split(' ')[0] for line in file.readlines() if line.strip()
-            ]
-            #  reset readlines() to start of file
-            print(f'seeking to line {file.seek(0)}')
-            presigned_urls = [
-                line.strip().split(' ')[1] for line in file.readlines() if line.strip()
-            ]
-        else:
-            presigned_urls = [line.strip() for line in file.readlines() if line.strip()]
+        lines = [line.strip() for line in file if line.strip()]
+    if filenames:
+        # parse each line once, rather than re-reading the file per column
+        names, presigned_urls = [], []
+        for line in lines:
+            name, url = line.split(' ')[:2]
+            names.append(name)
+            presigned_urls.append(url)
+    else:
+        presigned_urls = lines
 
     incorrect_urls = [url for url in presigned_urls if not url.startswith('https://')]
     if incorrect_urls:
@@ -61,17 +65,29 @@ def main(presigned_url_file_path: str, filenames: bool):
 
     output_path = dataset_path(output_prefix, 'upload')
 
-    # may as well batch them to reduce the number of VMs
-    for idx, url in enumerate(presigned_urls):
-        filename = names[idx] if names else os.path.basename(url).split('?')[0]
-        j = batch.new_job(f'URL {idx} ({filename})')
-        quoted_url = quote(url)
-        authenticate_cloud_credentials_in_job(job=j)
+    transfers = [
+        (url, names[idx] if names else os.path.basename(url).split('?')[0])
+        for idx, url in enumerate(presigned_urls)
+    ]
+
+    # batch the transfers, to reduce the number of VMs (and container starts)
+    for start in range(0, len(transfers), urls_per_job):
+        chunk = transfers[start : start + urls_per_job]
+        j = batch.new_job(f'URLs {start}-{start + len(chunk) - 1}')
+        j.env('CLOUDSDK_AUTH_CREDENTIAL_FILE_OVERRIDE', GSA_KEY_PATH)
         # catch errors during the cURL
         j.command('set -euxo pipefail')
-        j.command(
-            f'curl -L {quoted_url} | gsutil cp - {os.path.join(output_path, filename)}',
-        )
+        # run the transfers concurrently, then wait on each in turn so that any
+        # failed transfer still fails the job
+        j.command('pids=()')
+        for url, filename in chunk:
+            quoted_url = quote(url)
+            quoted_destination = quote(os.path.join(output_path, filename))
+            j.command(
+                f'curl -L {quoted_url} | gcloud storage cp - {quoted_destination} &',
+            )
+            j.command('pids+=($!)')
+        j.command('for pid in "${pids[@]}"; do wait "$pid"; done')
 
     batch.run(wait=False)
 
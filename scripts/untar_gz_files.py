@@ -71,8 +71,8 @@ def main(bucket: str, subdir: str, blob_name: str, outdir: str):
         output_blob.upload_from_filename(filepath)
         logging.info(f'Uploaded {file} to gs://{bucket}/{subdir}/{outdir}/')
 
-        # Delete file after upload
-        subprocess.run(['rm', f'{filepath}'], check=True)
+        # Delete file after upload, in-process rather than forking 'rm' per file
+        os.remove(filepath)
         logging.info(f'Deleted {file} from disk')
 
     logging.info('All tarballs extracted and uploaded. Finishing...')
@@ -100,11 +100,16 @@ def main(search_path: str):
         logging.info('Nothing to do, quitting')
         sys.exit(0)
 
+    # the repo state doesn't change while jobs are being created, so only fork
+    # git (and look up the image) once, rather than once per tarball
+    commit = get_commit_hash()
+    driver_image = config['workflow']['driver_image']
+
     # iterate over targets, set each one off in parallel
     for blobname, blobsize in blobs:
         # create and config job
         job = get_batch().new_job(name=f'decompress {blobname}')
-        job.image(get_config()['workflow']['driver_image'])
+        job.image(driver_image)
         job.cpu(4)
         job.storage(f'{blobsize}Gi')
         authenticate_cloud_credentials_in_job(job)
@@ -113,7 +118,7 @@ def main(search_path: str):
             job,
             organisation='populationgenomics',
             repo_name='analysis-runner',
-            commit=get_commit_hash(),
+            commit=commit,
         )
         job.command('cd /io')
         job.command(
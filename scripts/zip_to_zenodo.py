@@ -18,7 +18,7 @@ so storage should be set to the expected size of the largest archive.
 """
 
 import os
-from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
 
 import click
 import requests
@@ -26,6 +26,22 @@ from google.cloud import storage
 
 storage_client = storage.Client()
 
+# files that are already compressed gain nothing from deflating them again,
+# so they're stored as-is rather than spending CPU time recompressing them
+PRECOMPRESSED_SUFFIXES = (
+    '.bam',
+    '.bgz',
+    '.bz2',
+    '.cram',
+    '.gz',
+    '.jpg',
+    '.png',
+    '.tbi',
+    '.xz',
+    '.zip',
+    '.zst',
+)
+
 
 def zip_tree(
     zip_fname: str,
@@ -49,7 +65,15 @@ def zip_tree(
 
             contents = blob.download_as_bytes()
             info = ZipInfo(filename=subname, date_time=blob.updated.utctimetuple())
-            zipf.writestr(info, contents, compress_type=ZIP_DEFLATED, compresslevel=9)
+            if subname.lower().endswith(PRECOMPRESSED_SUFFIXES):
+                zipf.writestr(info, contents, compress_type=ZIP_STORED)
+            else:
+                zipf.writestr(
+                    info,
+                    contents,
+                    compress_type=ZIP_DEFLATED,
+                    compresslevel=6,
+                )
 
             nfiles += 1
             if maxfiles is not None and nfiles >= maxfiles:
@@ -108,10 +132,13 @@ def main(
     The authentication token can also be specified via the ZENODO_TOKEN environment variable.
     """
     zenodo_host = 'sandbox.zenodo.org' if sandbox else 'zenodo.org'
-    params = {'access_token': token}
+
+    # reuse one keep-alive connection (and the token) for every Zenodo request
+    session = requests.Session()
+    session.params = {'access_token': token}
 
     deposit_query = f'https://{zenodo_host}/api/deposit/depositions/{deposit}'
-    response = requests.get(deposit_query, params=params, timeout=timeout)
+    response = session.get(deposit_query, timeout=timeout)
     response.raise_for_status()
     deposit_bucket = response.json()['links']['bucket']
 
@@ -123,7 +150,7 @@ def main(
         with open(zip_fname, 'rb') as fp:
             print(f'Uploading {zip_fname} to {zenodo_host}')
             upload_url = f'{deposit_bucket}/{zip_fname}'
-            response = requests.put(upload_url, data=fp, params=params, timeout=timeout)
+            response = session.put(upload_url, data=fp, timeout=timeout)
 
         response.raise_for_status()
         print(f'Uploaded {response.json()["size"]} bytes')
@@ -1,9 +1,9 @@
 # ruff: noqa: E402
 import dataclasses
 import datetime
-import json
-from shlex import quote
+from shlex import join, quote
 
+import orjson
 from aiohttp import web
 from util import (
     PUBSUB_TOPIC,
@@ -37,7 +37,7 @@ from cpg_utils.hail_batch import (
 )
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class AnalysisRunnerJobArgs:
     output: str
     dataset: str
@@ -204,7 +204,7 @@ def add_analysis_runner_routes(routes: web.RouteTableDef):
 
         # Publish the metadata to Pub/Sub.
         metadata['batch_url'] = url
-        publisher.publish(PUBSUB_TOPIC, json.dumps(metadata).encode('utf-8')).result()
+        publisher.publish(PUBSUB_TOPIC, orjson.dumps(metadata)).result()
 
         return web.Response(text=f'{url}/jobs/1\n')
 
@@ -299,8 +299,7 @@ def prepare_job_from_config(
         prepare_job_with_repo(job, job_config)
 
     # Finally, run the script.
-    escaped_script = ' '.join(quote(s) for s in job_config.script if s)
-    job.command(escaped_script)
+    job.command(join(s for s in job_config.script if s))
 
     return job
 
@@ -319,5 +318,5 @@ def prepare_job_with_repo(job: hb.batch.job.BashJob, config: AnalysisRunnerJobAr
 
     if config.cwd:
         job.command(f'cd {quote(config.cwd)}')
-    script = config.script
-    job.command(f'which {quote(script[0])} || chmod +x {quote(script[0])}')
+    executable = quote(config.script[0])
+    job.command(f'which {executable} || chmod +x {executable}')
@@ -16,7 +16,7 @@ from util import (
 from cpg_utils.config import update_dict
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class AnalysisRunnerConfigArgs:
     dataset: str
     output_prefix: str
@@ -61,6 +61,8 @@ def add_config_routes(routes: web.RouteTableDef):
         if user_config := params.get('config'):  # Update with user-specified configs.
             update_dict(run_config, user_config)
 
+        # stdlib json, as the user's config may hold integers wider than the
+        # 64 bits orjson supports
         return web.Response(
             status=200,
             body=json.dumps(run_config).encode('utf-8'),
@@ -4,13 +4,14 @@ Exports 'add_cromwell_routes', to add the following route to a flask API:
 """
 
 import dataclasses
-import json
-import os
 from datetime import datetime
 from shlex import quote
 
+import orjson
 import requests
 from aiohttp import web
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from util import (
     PUBSUB_TOPIC,
     check_dataset_and_group,
@@ -20,6 +21,7 @@ from util import (
     get_and_check_image,
     get_and_check_repository,
     get_baseline_run_config,
+    get_cromwell_oauth_token,
     get_email_from_request,
     get_hail_token,
     get_server_config,
@@ -32,7 +34,7 @@ import hailtop.batch as hb
 
 from cpg_utils.config import AR_GUID_NAME, update_dict
 from cpg_utils.constants import CROMWELL_URL
-from cpg_utils.cromwell import get_cromwell_oauth_token, run_cromwell_workflow
+from cpg_utils.cromwell import run_cromwell_workflow
 from cpg_utils.git import guess_script_github_url_from
 from cpg_utils.hail_batch import (
     prepare_git_job,
@@ -40,8 +42,22 @@ from cpg_utils.hail_batch import (
     run_batch_job_and_print_url,
 )
 
+# shared across requests, so the connection to cromwell is kept alive between
+# calls, and transient gateway errors are retried
+cromwell_session = requests.Session()
+cromwell_session.mount(
+    CROMWELL_URL,
+    HTTPAdapter(
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+        ),
+    ),
+)
+
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class CromwellJobArgs:
     dataset: str
     access_level: str
@@ -234,7 +250,7 @@ def add_cromwell_routes(routes: web.RouteTableDef):
 
         # Publish the metadata to Pub/Sub.
         metadata['batch_url'] = url
-        publisher.publish(PUBSUB_TOPIC, json.dumps(metadata).encode('utf-8')).result()
+        publisher.publish(PUBSUB_TOPIC, orjson.dumps(metadata)).result()
 
         return web.Response(text=f'{url}/jobs/1\n')
 
@@ -243,23 +259,69 @@ def add_cromwell_routes(routes: web.RouteTableDef):
         try:
             workflow_id = request.match_info['workflow_id']
             cromwell_metadata_url = (
-                CROMWELL_URL
-                + f'/api/workflows/v1/{workflow_id}/metadata?expandSubWorkflows=true'
+                CROMWELL_URL + f'/api/workflows/v1/{workflow_id}/metadata'
             )
+            # forward cromwell's own filters, so callers that only need a few keys
+            # (eg: ?includeKey=status&expandSubWorkflows=false) get a tiny payload
+            query_params = [
+                ('expandSubWorkflows', request.query.get('expandSubWorkflows', 'true')),
+                *(
+                    (key, value)
+                    for key, value in request.query.items()
+                    if key in ('includeKey', 'excludeKey')
+                ),
+            ]
 
-            token = get_cromwell_oauth_token()
-            headers = {'Authorization': 'Bearer ' + str(token)}
             # longer timeout because metadata can take a while to fetch
-            req = requests.get(cromwell_metadata_url, headers=headers, timeout=120)
+            req = get_from_cromwell(
+                cromwell_metadata_url,
+                params=query_params,
+                timeout=120,
+            )
             if not req.ok:
-                raise web.HTTPInternalServerError(
-                    reason=req.content.decode() or req.reason,
+                # cromwell pretty-prints its JSON errors, which can't be used as a
+                # (single line) reason phrase, so send them on as the body instead
+                error_kwargs: dict[str, str] = (
+                    {'text': req.text, 'content_type': 'application/json'}
+                    if req.text
+                    else {'reason': req.reason}
                 )
-            return web.json_response(req.json())
+                # pass permanent errors (eg: an unknown or malformed workflow ID)
+                # through, so callers don't mistake them for transient failures
+                if req.status_code == web.HTTPNotFound.status_code:
+                    raise web.HTTPNotFound(**error_kwargs)
+                if req.status_code == web.HTTPBadRequest.status_code:
+                    raise web.HTTPBadRequest(**error_kwargs)
+                raise web.HTTPInternalServerError(**error_kwargs)
+            # pass the body straight through, it's already JSON and can be very large
+            return web.Response(body=req.content, content_type='application/json')
         except web.HTTPError:
             raise
         except Exception as e:  # noqa: BLE001
-            raise web.HTTPInternalServerError(reason=str(e)) from e
+            raise web.HTTPInternalServerError(text=str(e)) from e
+
+
+def get_from_cromwell(url: str, params: list, timeout: int) -> requests.Response:
+    """
+    GET from cromwell with the cached identity token, only minting a new
+    token if cromwell rejects the cached one (eg: it expired early)
+    """
+
+    def _get() -> requests.Response:
+        headers = {'Authorization': f'Bearer {get_cromwell_oauth_token()}'}
+        return cromwell_session.get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+        )
+
+    response = _get()
+    if response.status_code in (401, 403):
+        get_cromwell_oauth_token.cache_clear()
+        response = _get()
+
+    return response
 
 
 def get_args_from_params(
@@ -334,4 +396,4 @@ def get_workflow_output_dir(config: dict, job_args: CromwellJobArgs) -> str:
         else:
             bucket_path = f'gs://cpg-{job_args.dataset}-main'
 
-    return os.path.join(bucket_path, job_args.output)
+    return f'{bucket_path.rstrip("/")}/{job_args.output}'
@@ -1,11 +1,11 @@
 """The analysis-runner server, running Hail Batch pipelines on users' behalf."""
 
 # ruff: noqa: E402
-import json
 import logging
 import traceback
 
 import nest_asyncio
+import orjson
 from aiohttp import web
 from ar import add_analysis_runner_routes
 from config import add_config_routes
@@ -35,9 +35,7 @@ def prepare_exception_json_response(
     """Prepare web.Response for"""
     return web.Response(
         status=status_code,
-        body=json.dumps({'message': message, 'success': False, 'traceback': tb}).encode(
-            'utf-8',
-        ),
+        body=orjson.dumps({'message': message, 'success': False, 'traceback': tb}),
         content_type='application/json',
     )
 
@@ -2,12 +2,13 @@
 Utility methods for analysis-runner server
 """
 
-import json
+import copy
 import os
 import random
 import uuid
 from typing import Any
 
+import orjson
 import toml
 from aiohttp import ClientSession, web
 from cachetools.func import ttl_cache
@@ -17,9 +18,14 @@ from google.cloud import pubsub_v1, secretmanager
 import hailtop.batch as hb
 from hailtop.config import get_deploy_config
 
-from cpg_utils.cloud import email_from_id_token, read_secret
+from cpg_utils.cloud import (
+    email_from_id_token,
+    get_google_identity_token,
+    read_secret,
+)
 from cpg_utils.config import AR_GUID_NAME, get_cpg_namespace, update_dict
-from cpg_utils.membership import is_member_in_cached_group
+from cpg_utils.constants import CROMWELL_AUDIENCE
+from cpg_utils.membership import get_cached_group_members
 
 ANALYSIS_RUNNER_PROJECT_ID = 'analysis-runner'
 GITHUB_ORG = 'populationgenomics'
@@ -56,22 +62,45 @@ def generate_ar_guid() -> str:
     return guid.lower()
 
 
-# cache the result for 60 seconds, so we can call this function multiple times
+# cache the result for 10 minutes, so every route (and repeated submissions) can
+# call this function without re-reading the secret
 @ttl_cache(maxsize=1, ttl=600)
 def get_server_config() -> dict:
     """Get the server-config from the secret manager"""
 
     server_config = os.getenv('SERVER_CONFIG')
     if server_config:
-        return json.loads(server_config)
+        return orjson.loads(server_config)
 
     server_config_value = read_secret(ANALYSIS_RUNNER_PROJECT_ID, 'server-config')
     if server_config_value:
-        return json.loads(server_config_value)
+        return orjson.loads(server_config_value)
 
     raise web.HTTPInternalServerError(reason='Failed to read server-config secret')
 
 
+# identity tokens are valid for an hour, so refresh 5 minutes before they expire
+@ttl_cache(maxsize=1, ttl=55 * 60)
+def get_cromwell_oauth_token() -> str:
+    """
+    Get an identity token for the Cromwell audience, minted in-process
+    (rather than forking 'gcloud auth print-identity-token' per request)
+    """
+    return get_google_identity_token(CROMWELL_AUDIENCE)
+
+
+# cache group members for a minute, so repeated submissions don't re-read the
+# members cache file from GCS on every request, but access changes apply quickly
+@ttl_cache(maxsize=64, ttl=60)
+def _get_cached_group_members(group: str) -> frozenset[str]:
+    """Get the (lower-cased) members of a group from the members cache"""
+    members = get_cached_group_members(
+        group,
+        members_cache_location=MEMBERS_CACHE_LOCATION,
+    )
+    return frozenset(member.lower() for member in members)
+
+
 async def _get_hail_version(environment: str) -> str:
     """ASYNC get hail version for the hail server in the local deploy_config"""
     if not environment == 'gcp':
@@ -152,11 +181,7 @@ def check_dataset_and_group(
             reason='The analysis-runner does not support checking group members for '
             f'the {environment} environment',
         )
-    if not is_member_in_cached_group(
-        f'{dataset}-analysis',
-        email,
-        members_cache_location=MEMBERS_CACHE_LOCATION,
-    ):
+    if email.lower() not in _get_cached_group_members(f'{dataset}-analysis'):
         raise web.HTTPForbidden(
             reason=f'{email} is not a member of the {dataset} analysis group',
         )
@@ -264,6 +289,33 @@ def get_baseline_run_config(
             'status_reporter': DEFAULT_STATUS_REPORTER,
         },
     }
+    # the templates are shared by every submission, so merge in a (deep) copy of the
+    # cached values rather than letting later updates mutate the cache
+    update_dict(
+        baseline_config,
+        copy.deepcopy(
+            _get_template_config(
+                config_prefix=config_prefix,
+                environment=environment,
+                dataset=dataset,
+                access_level=access_level,
+            ),
+        ),
+    )
+    return baseline_config
+
+
+@ttl_cache(maxsize=64, ttl=600)
+def _get_template_config(
+    config_prefix: str,
+    environment: str,
+    dataset: str,
+    access_level: str,
+) -> dict:
+    """
+    Read and merge the template configs for a dataset / access-level, these are
+    identical for every submission so are cached instead of re-read from the bucket
+    """
     template_paths = [
         AnyPath(config_prefix) / 'templates' / suf
         for suf in [
@@ -277,10 +329,11 @@ def get_baseline_run_config(
     if missing := [p for p in template_paths if not p.exists()]:
         raise ValueError(f'Missing expected template configs: {missing}')
 
+    template_config: dict = {}
     for path in template_paths:
         with path.open() as f:
-            update_dict(baseline_config, toml.load(f))
-    return baseline_config
+            update_dict(template_config, toml.load(f))
+    return template_config
 
 
 def get_and_check_script(params: dict) -> list[str]:
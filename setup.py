@@ -31,8 +31,8 @@ setuptools.setup(
         'cloudpathlib[all]',
         'cpg-utils>=5.0.0',
         'hail',
+        'orjson',
         'requests',
-        'tabulate',
     ],
     entry_points={
         'console_scripts': ['analysis-runner=analysis_runner.cli:main_from_args'],
@@ -1,15 +1,17 @@
-# ruff: noqa: S105
+# ruff: noqa: S105, PT009, PT027
 import unittest
 from typing import Any, Optional
 from unittest.mock import MagicMock, patch
 
 from analysis_runner._version import __version__
 from analysis_runner.cli import main_from_args
+from analysis_runner.cli_cromwell import parse_additional_args, try_parse_value
 
 IMPORT_AR_IDENTITY_TOKEN_PATH = (
     'analysis_runner.cli_analysisrunner.get_google_identity_token'
 )
 IMPORT_CR_IDENTITY_TOKEN_PATH = 'analysis_runner.cli_cromwell.get_google_identity_token'
+IMPORT_CR_VERSION_CHECK_PATH = 'analysis_runner.cli_cromwell._perform_version_check'
 
 REQUEST_POST_PATH = 'requests.post'
 REQUEST_GET_PATH = 'requests.get'
@@ -99,6 +101,28 @@ class TestCliAnalysisRunner(unittest.TestCase):
 
 
 class TestCliCromwell(unittest.TestCase):
+    # an explicit repository and commit, so submitting doesn't depend on the
+    # local git remote
+    SUBMIT_ARGS = (
+        'cromwell',
+        'submit',
+        '--dataset',
+        'fewgenomes',
+        '--access-level',
+        'test',
+        '--description',
+        'mock-test',
+        '--output-dir',
+        'hello-world-test',
+        '--repository',
+        'analysis-runner',
+        '--commit',
+        '<mocked-commit>',
+        '--cwd',
+        '.',
+        'workflow.wdl',
+    )
+
     @patch(IMPORT_CR_IDENTITY_TOKEN_PATH)
     @patch(REQUEST_POST_PATH)
     def test_submit_cli(self, mock_post: MagicMock, mock_identity_token: MagicMock):
@@ -126,6 +150,112 @@ class TestCliCromwell(unittest.TestCase):
         mock_post.assert_called()
         mock_identity_token.assert_called()
 
+    @patch(IMPORT_CR_VERSION_CHECK_PATH)
+    @patch(IMPORT_CR_IDENTITY_TOKEN_PATH)
+    @patch(REQUEST_POST_PATH)
+    def test_submit_large_integer_input(
+        self,
+        mock_post: MagicMock,
+        mock_identity_token: MagicMock,
+        mock_version_check: MagicMock,
+    ):
+        apply_mock_behaviour(
+            mock_post=mock_post,
+            mock_identity_token=mock_identity_token,
+        )
+        large_integer = 123456789012345678901234
+
+        main_from_args([*self.SUBMIT_ARGS, '--sample-barcode', str(large_integer)])
+
+        mock_version_check.assert_called()
+        mock_post.assert_called_once()
+        self.assertEqual(
+            mock_post.call_args.kwargs['json']['inputs_dict'],
+            {'sample_barcode': large_integer},
+        )
+
+    @patch(IMPORT_CR_VERSION_CHECK_PATH)
+    @patch('builtins.print')
+    def test_dry_run_large_integer_input(
+        self,
+        mock_print: MagicMock,
+        mock_version_check: MagicMock,
+    ):
+        large_integer = 123456789012345678901234
+
+        main_from_args(
+            [
+                *self.SUBMIT_ARGS[:-1],
+                '--dry-run',
+                self.SUBMIT_ARGS[-1],
+                '--sample-barcode',
+                str(large_integer),
+            ],
+        )
+
+        mock_version_check.assert_called()
+        mock_print.assert_called_once()
+        self.assertIn(
+            f'"sample_barcode": {large_integer}',
+            mock_print.call_args.args[0],
+        )
+
+
+    @patch(IMPORT_CR_VERSION_CHECK_PATH)
+    @patch(REQUEST_POST_PATH)
+    def test_submit_values_without_keyword(
+        self,
+        mock_post: MagicMock,
+        mock_version_check: MagicMock,
+    ):
+        with self.assertRaises(SystemExit) as context:
+            main_from_args([*self.SUBMIT_ARGS, 'value', '--keyword', 'value'])
+
+        mock_version_check.assert_called()
+        self.assertIn('Invalid workflow inputs', str(context.exception.code))
+        mock_post.assert_not_called()
+
+
+class TestParseAdditionalArgs(unittest.TestCase):
+    def test_try_parse_value(self):
+        self.assertEqual(try_parse_value('1'), 1)
+        self.assertEqual(try_parse_value('-2'), -2)
+        self.assertEqual(try_parse_value('3.5'), 3.5)
+        self.assertEqual(try_parse_value('1e3'), 1000.0)
+        self.assertEqual(try_parse_value('true'), True)
+        self.assertEqual(try_parse_value('false'), False)
+        self.assertEqual(try_parse_value('null'), 'null')
+        self.assertEqual(try_parse_value('nan'), 'nan')
+        self.assertEqual(try_parse_value('gs://bucket/1.cram'), 'gs://bucket/1.cram')
+
+    def test_flags_and_values(self):
+        self.assertDictEqual(
+            parse_additional_args(['--keyword1', '--keyword-2', '--val', '3']),
+            {'keyword1': True, 'keyword_2': True, 'val': 3},
+        )
+        self.assertDictEqual(
+            parse_additional_args(['--keyword', 'val1', 'val2']),
+            {'keyword': ['val1', 'val2']},
+        )
+
+    def test_repeated_keywords(self):
+        self.assertDictEqual(
+            parse_additional_args(['--keyword', 'value', '--keyword']),
+            {'keyword': ['value']},
+        )
+        self.assertDictEqual(
+            parse_additional_args(
+                ['--keyword', 'val1_a', 'val1_b', '--keyword', 'val2_a', 'val2_b'],
+            ),
+            {'keyword': [['val1_a', 'val1_b'], ['val2_a', 'val2_b']]},
+        )
+
+    def test_values_without_keyword(self):
+        for args in (['value', '--keyword', 'value'], ['value']):
+            with self.subTest(args=args), self.assertRaises(ValueError):
+                parse_additional_args(args)
+        self.assertDictEqual(parse_additional_args([]), {})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -9,6 +9,7 @@ from typing import Optional
 import google.auth.transport.requests
 import google.cloud.storage
 import google.oauth2.id_token
+from cachetools.func import ttl_cache
 from flask import Flask, Response, abort, request, stream_with_context
 
 from cpg_utils.cloud import read_secret
@@ -32,6 +33,17 @@ storage_client = google.cloud.storage.Client()
 logger = logging.getLogger('gunicorn.error')
 
 
+# cache the result for 10 minutes, rather than reading the secret on every request
+@ttl_cache(maxsize=1, ttl=600)
+def get_server_config() -> dict:
+    """Get the server-config from the secret manager"""
+    server_config_raw = read_secret(ANALYSIS_RUNNER_PROJECT_ID, 'server-config')
+    if not server_config_raw:
+        # raise rather than return, so that a failed read isn't cached
+        raise ValueError('Failed to read server-config secret')
+    return json.loads(server_config_raw)
+
+
 @app.route('/<dataset>/<path:filename>')
 def handler(  # noqa: C901
     dataset: Optional[str] = None,
@@ -65,11 +77,11 @@ def handler(  # noqa: C901
     if os.path.basename(filename) == '.access':
         return abort(403, 'Unable to read .access files')
 
-    server_config_raw = read_secret(ANALYSIS_RUNNER_PROJECT_ID, 'server-config')
-    if not server_config_raw:
+    try:
+        server_config = get_server_config()
+    except ValueError:
         logger.exception('Failed to read server-config secret')
         return abort(500, 'Failed to read server-config secret')
-    server_config = json.loads(server_config_raw)
     if dataset not in server_config:
         logger.warning(f'Invalid dataset "{dataset}"')
         return abort(403, 'Invalid dataset')